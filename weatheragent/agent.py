@@ -6,7 +6,6 @@ from .sub_agents.flood_agent.agent import flood_agent
 from .sub_agents.meterologist.agent import meterologist
 from .sub_agents.searcher.agent import searcher
 #from .sub_agents.stock_analyst.agent import stock_analyst
-from .tools.tools import get_current_time
 
 root_agent = Agent(
     name="weatheragent",
@@ -29,6 +28,5 @@ root_agent = Agent(
     sub_agents=[earthquake_agent, flood_agent,meterologist],
     tools=[
         AgentTool(searcher),
-    #     get_current_time,
     ],
 )
@@ -1,10 +1,56 @@
 import datetime
+import orjson
 import requests
-from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Union, Any
 from google.adk.agents import Agent
 
+from ...tools.cache import normalize_city, ttl_cache
+from ...tools.geocode_cache import persistent_geocode
+from ...tools.http_client import RETRY_AFTER, SESSION, TIMEOUT
+from ...tools.timezones import current_time
 
+_RISK_LEVELS = ("Low", "Moderate", "High")
+
+# Safety recommendations per risk tier, in _RISK_LEVELS order. The second item
+# is an optional note formatted with the maximum recorded magnitude.
+_SAFETY_RECOMMENDATIONS = (
+    (
+        (
+            "Maintain basic earthquake awareness",
+            "Keep emergency contact information updated",
+            "Be aware of safe spots in buildings",
+            "Consider basic emergency supplies",
+            "Stay informed about local seismic activity"
+        ),
+        None
+    ),
+    (
+        (
+            "Review earthquake preparedness guidelines",
+            "Check and secure potential hazards in your home",
+            "Create or update emergency contact list",
+            "Stock basic emergency supplies",
+            "Practice earthquake safety drills with family"
+        ),
+        "Be prepared for earthquakes up to magnitude {max_magnitude}"
+    ),
+    (
+        (
+            "IMMEDIATE ACTION REQUIRED: Review and update earthquake emergency plans",
+            "Secure heavy furniture and objects to walls",
+            "Prepare emergency supplies including water, food, and first-aid kit",
+            "Identify safe spots in each room (under sturdy tables, against interior walls)",
+            "Keep important documents in an easily accessible, waterproof container",
+            "Learn how to shut off gas, water, and electricity"
+        ),
+        "Area has experienced magnitude {max_magnitude} earthquake - maintain high preparedness"
+    )
+)
+
+
+@ttl_cache(maxsize=512, ttl=86400, key=normalize_city)
+@persistent_geocode
 def get_city_coordinates(city: str) -> Dict[str, Any]:
     """Get latitude and longitude for a city using Open-Meteo Geocoding API.
     
@@ -17,9 +63,9 @@ def get_city_coordinates(city: str) -> Dict[str, Any]:
     try:
         geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
         geocoding_params = {"name": city, "count": 1}
-        response = requests.get(geocoding_url, params=geocoding_params)
+        response = SESSION.get(geocoding_url, params=geocoding_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get("results"):
             result = data["results"][0]
@@ -36,6 +82,12 @@ def get_city_coordinates(city: str) -> Dict[str, Any]:
                 "status": "error",
                 "error_message": f"City '{city}' not found."
             }
+    except requests.exceptions.Timeout:
+        return {
+            "status": "error",
+            "error_message": f"Timed out finding coordinates for '{city}'.",
+            "retry_after": RETRY_AFTER
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -43,6 +95,8 @@ def get_city_coordinates(city: str) -> Dict[str, Any]:
         }
 
 
+# Serve results up to six hours old if USGS is unreachable
+@ttl_cache(maxsize=256, ttl=900, max_stale=21600)
 def get_earthquake_data(
     min_magnitude: float = 4.0,
     days_back: int = 30,
@@ -50,7 +104,8 @@ def get_earthquake_data(
     city: Optional[str] = None,
     radius_km: Optional[int] = None,
     latitude: Optional[float] = None,
-    longitude: Optional[float] = None
+    longitude: Optional[float] = None,
+    detail: str = "full"
 ) -> Dict[str, Any]:
     """Get earthquake data from USGS API.
     
@@ -59,23 +114,35 @@ def get_earthquake_data(
         days_back (int): Number of days to look back for earthquakes (default: 30)
         limit (int): Maximum number of results to return (default: 50)
         city (Optional[str]): City name to search around (default: None)
-        radius_km (Optional[int]): Radius in kilometers to search around a location (default: None)
+        radius_km (Optional[int]): Radius in kilometers to search around a location. When a city is
+            given without a radius, 500 km is used so the query stays local (default: None)
         latitude (Optional[float]): Specific latitude to search around (default: None)
         longitude (Optional[float]): Specific longitude to search around (default: None)
+        detail (str): "full" for complete event details, or "minimal" for only time, magnitude
+            and place (default: "full")
         
     Returns:
-        Dict[str, Any]: Earthquake data or error message
+        Dict[str, Any]: Earthquake data or error message. If a refresh fails, a result for the
+            same query from the last six hours is returned with "stale": True instead of the error.
     """
+    if detail not in ("full", "minimal"):
+        return {
+            "status": "error",
+            "error_message": f"Invalid detail '{detail}'. Use 'full' or 'minimal'."
+        }
+    
     try:
         # Set up time parameters
         end_time = datetime.datetime.now()
         start_time = end_time - datetime.timedelta(days=days_back)
+        start_date = start_time.date().isoformat()
+        end_date = end_time.date().isoformat()
         
         # Base parameters for USGS API
         params = {
             "format": "geojson",
-            "starttime": start_time.strftime("%Y-%m-%d"),
-            "endtime": end_time.strftime("%Y-%m-%d"),
+            "starttime": start_date,
+            "endtime": end_date,
             "minmagnitude": min_magnitude,
             "orderby": "time",
             "limit": limit
@@ -87,13 +154,14 @@ def get_earthquake_data(
             if coords["status"] == "error":
                 return coords
             
-            if radius_km:
-                params.update({
-                    "latitude": coords["latitude"],
-                    "longitude": coords["longitude"],
-                    "maxradiuskm": radius_km
-                })
-        elif all(x is not None for x in [latitude, longitude, radius_km]):
+            # Always filter server-side around the city rather than pulling global results
+            radius_km = radius_km or 500
+            params.update({
+                "latitude": coords["latitude"],
+                "longitude": coords["longitude"],
+                "maxradiuskm": radius_km
+            })
+        elif latitude is not None and longitude is not None and radius_km is not None:
             params.update({
                 "latitude": latitude,
                 "longitude": longitude,
@@ -101,46 +169,26 @@ def get_earthquake_data(
             })
         
         # Make API request
-        response = requests.get("https://earthquake.usgs.gov/fdsnws/event/1/query", params=params)
+        response = SESSION.get("https://earthquake.usgs.gov/fdsnws/event/1/query", params=params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Format the response
-        events = []
-        for feature in data.get("features", []):
-            props = feature["properties"]
-            coords = feature["geometry"]["coordinates"]
-            event_time = datetime.datetime.fromtimestamp(props["time"] / 1000)
-            
-            events.append({
-                "time": event_time.isoformat(),
-                "date": event_time.strftime("%Y-%m-%d"),
-                "time_of_day": event_time.strftime("%H:%M:%S"),
-                "magnitude": round(props["mag"], 1),
-                "place": props["place"],
-                "depth_km": round(coords[2], 1),
-                "latitude": round(coords[1], 4),
-                "longitude": round(coords[0], 4),
-                "significance": props.get("sig", 0),
-                "alert_level": props.get("alert", "none"),
-                "tsunami_warning": "Yes" if props.get("tsunami", 0) == 1 else "No",
-                "felt_reports": props.get("felt", 0),
-                "status": props.get("status", "unknown"),
-                "details_url": props.get("url", "")
-            })
+        format_event = _format_event if detail == "full" else _format_minimal_event
+        events = [format_event(feature) for feature in data.get("features", ())]
         
         result = {
             "status": "success",
             "total_events": len(events),
             "events": events,
             "query_info": {
-                "start_date": start_time.strftime("%Y-%m-%d"),
-                "end_date": end_time.strftime("%Y-%m-%d"),
+                "start_date": start_date,
+                "end_date": end_date,
                 "min_magnitude": min_magnitude,
                 "limit": limit
             },
             "metadata": {
-                "generated": datetime.datetime.now().isoformat(),
+                "generated": end_time.isoformat(),
                 "api": "USGS Earthquake API",
                 "url": data.get("metadata", {}).get("url", "")
             }
@@ -160,6 +208,12 @@ def get_earthquake_data(
         
         return result
         
+    except requests.exceptions.Timeout:
+        return {
+            "status": "error",
+            "error_message": "Timed out fetching earthquake data from USGS.",
+            "retry_after": RETRY_AFTER
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -167,6 +221,55 @@ def get_earthquake_data(
         }
 
 
+def _format_event(feature: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a USGS GeoJSON feature into an event summary.
+    
+    Args:
+        feature (Dict[str, Any]): A single feature from the USGS response
+        
+    Returns:
+        Dict[str, Any]: Event details
+    """
+    props = feature["properties"]
+    position = feature["geometry"]["coordinates"]
+    event_time = datetime.datetime.fromtimestamp(props["time"] / 1000).isoformat()
+    
+    return {
+        "time": event_time,
+        "epoch_ms": props["time"],
+        "date": event_time[:10],
+        "time_of_day": event_time[11:19],
+        "magnitude": round(props["mag"], 1),
+        "place": props["place"],
+        "depth_km": round(position[2], 1),
+        "latitude": round(position[1], 4),
+        "longitude": round(position[0], 4),
+        "significance": props.get("sig", 0),
+        "alert_level": props.get("alert", "none"),
+        "tsunami_warning": "Yes" if props.get("tsunami", 0) == 1 else "No",
+        "felt_reports": props.get("felt", 0),
+        "status": props.get("status", "unknown"),
+        "details_url": props.get("url", "")
+    }
+
+
+def _format_minimal_event(feature: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a USGS GeoJSON feature into the fields needed for risk analysis.
+    
+    Args:
+        feature (Dict[str, Any]): A single feature from the USGS response
+        
+    Returns:
+        Dict[str, Any]: Event time, magnitude and place
+    """
+    props = feature["properties"]
+    return {
+        "epoch_ms": props["time"],
+        "magnitude": round(props["mag"], 1),
+        "place": props["place"]
+    }
+
+
 def analyze_earthquake_risk(
     location: str,
     days_back: int = 90,
@@ -180,7 +283,8 @@ def analyze_earthquake_risk(
         radius_km (int): Radius in kilometers to analyze (default: 300)
         
     Returns:
-        Dict[str, Any]: Risk assessment and recommendations
+        Dict[str, Any]: Risk assessment and recommendations, marked "stale": True when based on
+            cached data because USGS could not be reached
     """
     try:
         # Get earthquake data
@@ -189,39 +293,54 @@ def analyze_earthquake_risk(
             days_back=days_back,
             radius_km=radius_km,
             min_magnitude=2.0,
-            limit=1000
+            limit=1000,
+            detail="minimal"
         )
         
         if data["status"] == "error":
             return data
         
+        # Measure recency from when the data was fetched, which may be earlier
+        # than now if it came from the cache
+        data_as_of = datetime.datetime.fromisoformat(data["metadata"]["generated"])
+        
         events = data["events"]
         if not events:
-            return {
+            result = {
                 "status": "success",
                 "location": location,
                 "risk_level": "Undetermined",
-                "message": "No significant seismic activity recorded in this period."
+                "message": "No significant seismic activity recorded in this period.",
+                "data_as_of": data_as_of.isoformat()
             }
+            if data.get("stale"):
+                result["stale"] = True
+            return result
         
         # Analyze the data
-        magnitudes = [event["magnitude"] for event in events]
-        max_magnitude = max(magnitudes)
-        significant_events = len([m for m in magnitudes if m >= 4.0])
-        recent_events = len([e for e in events if 
-            (datetime.datetime.now() - datetime.datetime.fromisoformat(e["time"])).days <= 30])
+        recent_cutoff_ms = int((data_as_of - datetime.timedelta(days=30)).timestamp() * 1000)
+        max_magnitude = events[0]["magnitude"]
+        total_magnitude = 0.0
+        significant_events = 0
+        recent_events = 0
+        for event in events:
+            magnitude = event["magnitude"]
+            total_magnitude += magnitude
+            if magnitude > max_magnitude:
+                max_magnitude = magnitude
+            if magnitude >= 4.0:
+                significant_events += 1
+            if event["epoch_ms"] >= recent_cutoff_ms:
+                recent_events += 1
         
         # Determine risk level
-        risk_level = "Low"
-        if max_magnitude >= 6.0 or significant_events >= 5:
-            risk_level = "High"
-        elif max_magnitude >= 4.5 or significant_events >= 3:
-            risk_level = "Moderate"
+        risk_tier = _risk_tier(max_magnitude, significant_events)
+        risk_level = _RISK_LEVELS[risk_tier]
         
         # Generate recommendations
-        recommendations = _generate_safety_recommendations(risk_level, max_magnitude)
+        recommendations = _generate_safety_recommendations(risk_tier, max_magnitude)
         
-        return {
+        result = {
             "status": "success",
             "location": location,
             "risk_level": risk_level,
@@ -232,11 +351,15 @@ def analyze_earthquake_risk(
                 "significant_events": significant_events,
                 "recent_events_30d": recent_events,
                 "max_magnitude": max_magnitude,
-                "average_magnitude": round(sum(magnitudes) / len(magnitudes), 1)
+                "average_magnitude": round(total_magnitude / len(events), 1)
             },
             "recommendations": recommendations,
+            "data_as_of": data_as_of.isoformat(),
             "generated_at": datetime.datetime.now().isoformat()
         }
+        if data.get("stale"):
+            result["stale"] = True
+        return result
         
     except Exception as e:
         return {
@@ -245,47 +368,79 @@ def analyze_earthquake_risk(
         }
 
 
-def _generate_safety_recommendations(risk_level: str, max_magnitude: float) -> List[str]:
-    """Generate safety recommendations based on risk level.
+def analyze_earthquake_risk_batch(
+    locations: List[str],
+    days_back: int = 90,
+    radius_km: int = 300
+) -> Dict[str, Any]:
+    """Analyze earthquake risk for several locations at once.
+    
+    The locations are analyzed concurrently, so comparing N cities takes
+    roughly as long as the slowest single analysis.
     
     Args:
-        risk_level (str): Assessed risk level
-        max_magnitude (float): Maximum recorded magnitude
+        locations (List[str]): Names of the cities or locations
+        days_back (int): Number of days of historical data to analyze (default: 90)
+        radius_km (int): Radius in kilometers to analyze (default: 300)
         
     Returns:
-        List[str]: List of safety recommendations
+        Dict[str, Any]: Risk assessment for each location, in the order given, marked "stale": True
+            if any assessment used cached data
     """
-    recommendations = []
+    if not locations:
+        return {
+            "status": "error",
+            "error_message": "At least one location is required."
+        }
     
-    if risk_level == "High":
-        recommendations.extend([
-            "IMMEDIATE ACTION REQUIRED: Review and update earthquake emergency plans",
-            "Secure heavy furniture and objects to walls",
-            "Prepare emergency supplies including water, food, and first-aid kit",
-            "Identify safe spots in each room (under sturdy tables, against interior walls)",
-            "Keep important documents in an easily accessible, waterproof container",
-            "Learn how to shut off gas, water, and electricity",
-            f"Area has experienced magnitude {max_magnitude} earthquake - maintain high preparedness"
-        ])
-    elif risk_level == "Moderate":
-        recommendations.extend([
-            "Review earthquake preparedness guidelines",
-            "Check and secure potential hazards in your home",
-            "Create or update emergency contact list",
-            "Stock basic emergency supplies",
-            "Practice earthquake safety drills with family",
-            f"Be prepared for earthquakes up to magnitude {max_magnitude}"
-        ])
-    else:
-        recommendations.extend([
-            "Maintain basic earthquake awareness",
-            "Keep emergency contact information updated",
-            "Be aware of safe spots in buildings",
-            "Consider basic emergency supplies",
-            "Stay informed about local seismic activity"
-        ])
+    with ThreadPoolExecutor(max_workers=min(len(locations), 8)) as executor:
+        results = list(executor.map(
+            lambda location: analyze_earthquake_risk(location, days_back=days_back, radius_km=radius_km),
+            locations
+        ))
     
-    return recommendations
+    batch = {
+        "status": "success",
+        "total_locations": len(locations),
+        "results": results,
+        "generated_at": datetime.datetime.now().isoformat()
+    }
+    if any(result.get("stale") for result in results):
+        batch["stale"] = True
+    return batch
+
+
+def _risk_tier(max_magnitude: float, significant_events: int) -> int:
+    """Map recent seismic activity to a risk tier.
+    
+    Args:
+        max_magnitude (float): Maximum recorded magnitude
+        significant_events (int): Number of magnitude 4.0+ events
+        
+    Returns:
+        int: Index into _RISK_LEVELS (0 = Low, 1 = Moderate, 2 = High)
+    """
+    if max_magnitude >= 6.0 or significant_events >= 5:
+        return 2
+    if max_magnitude >= 4.5 or significant_events >= 3:
+        return 1
+    return 0
+
+
+def _generate_safety_recommendations(risk_tier: int, max_magnitude: float) -> List[str]:
+    """Generate safety recommendations based on risk tier.
+    
+    Args:
+        risk_tier (int): Assessed risk tier from _risk_tier
+        max_magnitude (float): Maximum recorded magnitude
+        
+    Returns:
+        List[str]: List of safety recommendations
+    """
+    recommendations, magnitude_note = _SAFETY_RECOMMENDATIONS[risk_tier]
+    if magnitude_note is None:
+        return list(recommendations)
+    return [*recommendations, magnitude_note.format(max_magnitude=max_magnitude)]
 
 
 def get_current_time(city: str) -> dict:
@@ -297,42 +452,7 @@ def get_current_time(city: str) -> dict:
     Returns:
         dict: status and result or error msg.
     """
-    coords = get_city_coordinates(city)
-    if coords["status"] == "error":
-        return coords
-    
-    try:
-        # Use the timezone from geocoding result or fallback to auto
-        tz_identifier = coords.get("timezone", "auto")
-        
-        if tz_identifier == "auto":
-            # Fallback for common cities
-            city_lower = city.lower()
-            timezone_map = {
-                "new york": "America/New_York",
-                "london": "Europe/London",
-                "paris": "Europe/Paris",
-                "tokyo": "Asia/Tokyo",
-                "sydney": "Australia/Sydney",
-                "los angeles": "America/Los_Angeles",
-                "chicago": "America/Chicago",
-                "berlin": "Europe/Berlin",
-                "mumbai": "Asia/Kolkata",
-                "beijing": "Asia/Shanghai"
-            }
-            tz_identifier = timezone_map.get(city_lower, "UTC")
-        
-        tz = ZoneInfo(tz_identifier)
-        now = datetime.datetime.now(tz)
-        report = (
-            f'The current time in {coords["name"]} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
-        )
-        return {"status": "success", "report": report}
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error getting time for '{city}': {str(e)}"
-        }
+    return current_time(city, get_city_coordinates)
 
 
 # Create the earthquake agent with tools
@@ -353,6 +473,7 @@ earthquake_agent = Agent(
     tools=[
         get_earthquake_data,
         analyze_earthquake_risk,
+        analyze_earthquake_risk_batch,
         get_city_coordinates,
         get_current_time
     ]
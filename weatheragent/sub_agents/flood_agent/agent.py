@@ -1,10 +1,17 @@
 import datetime
-import requests
-from zoneinfo import ZoneInfo
+import orjson
 from typing import Dict, List, Optional, Union
 from google.adk.agents import Agent
 
+from ...tools.cache import normalize_city, ttl_cache
+from ...tools.geocode_cache import persistent_geocode
+from ...tools.http_client import SESSION, TIMEOUT
+from ...tools.open_meteo import fetch_daily_archive
+from ...tools.timezones import current_time
 
+
+@ttl_cache(maxsize=512, ttl=86400, key=normalize_city)
+@persistent_geocode
 def get_city_coordinates(city: str) -> dict:
     """Get latitude and longitude for a city using Open-Meteo Geocoding API.
     
@@ -17,9 +24,9 @@ def get_city_coordinates(city: str) -> dict:
     try:
         geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
         geocoding_params = {"name": city, "count": 1}
-        response = requests.get(geocoding_url, params=geocoding_params)
+        response = SESSION.get(geocoding_url, params=geocoding_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get("results"):
             result = data["results"][0]
@@ -72,9 +79,9 @@ def get_flood_forecast(city: str, forecast_days: int = 7, include_ensemble: bool
             "timezone": "auto"
         }
         
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if "daily" not in data:
             return {
@@ -216,21 +223,8 @@ def get_historical_flood_data(city: str, start_date: str, end_date: str) -> dict
         return coords
     
     try:
-        # Note: Historical flood data might use archive API
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        
-        params = {
-            "latitude": coords["latitude"],
-            "longitude": coords["longitude"],
-            "start_date": start_date,
-            "end_date": end_date,
-            "daily": "precipitation_sum,temperature_2m_max,temperature_2m_min",
-            "timezone": "auto"
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        # Shares the archive fetch (and its cache) with the meteorologist
+        data = fetch_daily_archive(coords["latitude"], coords["longitude"], start_date, end_date)
         
         if "daily" not in data:
             return {
@@ -413,42 +407,7 @@ def get_current_time(city: str) -> dict:
     Returns:
         dict: status and result or error msg.
     """
-    coords = get_city_coordinates(city)
-    if coords["status"] == "error":
-        return coords
-    
-    try:
-        # Use the timezone from geocoding result or fallback to auto
-        tz_identifier = coords.get("timezone", "auto")
-        
-        if tz_identifier == "auto":
-            # Fallback for common cities
-            city_lower = city.lower()
-            timezone_map = {
-                "new york": "America/New_York",
-                "london": "Europe/London",
-                "paris": "Europe/Paris",
-                "tokyo": "Asia/Tokyo",
-                "sydney": "Australia/Sydney",
-                "los angeles": "America/Los_Angeles",
-                "chicago": "America/Chicago",
-                "berlin": "Europe/Berlin",
-                "mumbai": "Asia/Kolkata",
-                "beijing": "Asia/Shanghai"
-            }
-            tz_identifier = timezone_map.get(city_lower, "UTC")
-        
-        tz = ZoneInfo(tz_identifier)
-        now = datetime.datetime.now(tz)
-        report = (
-            f'The current time in {coords["name"]} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
-        )
-        return {"status": "success", "report": report}
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error getting time for '{city}': {str(e)}"
-        }
+    return current_time(city, get_city_coordinates)
 
 
 def _generate_flood_recommendations(risk_assessment: dict) -> List[str]:
@@ -1,8 +1,20 @@
+import calendar
 import datetime
-import requests
-from zoneinfo import ZoneInfo
+import orjson
+from typing import Optional
 from google.adk.agents import Agent
 
+from ...tools.cache import normalize_city, ttl_cache
+from ...tools.geocode_cache import persistent_geocode
+from ...tools.http_client import SESSION, TIMEOUT
+from ...tools.open_meteo import fetch_daily_archive
+from ...tools.timezones import current_time
+
+# Earliest date served by the Open-Meteo archive API
+_ARCHIVE_MIN_DATE = datetime.date(1940, 1, 1)
+
+@ttl_cache(maxsize=512, ttl=86400, key=normalize_city)
+@persistent_geocode
 def get_city_coordinates(city: str) -> dict:
     """Get latitude and longitude for a city using Open-Meteo Geocoding API.
     
@@ -15,9 +27,9 @@ def get_city_coordinates(city: str) -> dict:
     try:
         geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
         geocoding_params = {"name": city, "count": 1}
-        response = requests.get(geocoding_url, params=geocoding_params)
+        response = SESSION.get(geocoding_url, params=geocoding_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get("results"):
             result = data["results"][0]
@@ -41,6 +53,28 @@ def get_city_coordinates(city: str) -> dict:
         }
 
 
+def _resolve_coordinates(city: str, latitude: Optional[float], longitude: Optional[float]) -> dict:
+    """Use caller-supplied coordinates when both are given, otherwise geocode the city.
+    
+    Args:
+        city (str): The name of the city.
+        latitude (Optional[float]): Known latitude of the city.
+        longitude (Optional[float]): Known longitude of the city.
+        
+    Returns:
+        dict: status and coordinates or error message.
+    """
+    if latitude is not None and longitude is not None:
+        return {
+            "status": "success",
+            "latitude": latitude,
+            "longitude": longitude,
+            "name": city,
+            "country": ""
+        }
+    return get_city_coordinates(city)
+
+
 def get_weather_forecast(city: str, days: int = 3) -> dict:
     """Get detailed weather forecast for a city.
     
@@ -63,28 +97,36 @@ def get_weather_forecast(city: str, days: int = 3) -> dict:
         forecast_params = {
             "latitude": coords["latitude"],
             "longitude": coords["longitude"],
-            "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max,weather_code",
-            "hourly": "temperature_2m,precipitation,wind_speed_10m,weather_code",
+            "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max",
             "start_date": start_date,
             "end_date": end_date,
             "timezone": "auto"
         }
         
-        response = requests.get(forecast_url, params=forecast_params)
+        response = SESSION.get(forecast_url, params=forecast_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Format the forecast data
         daily_forecast = []
         if "daily" in data:
-            for i, date in enumerate(data["daily"]["time"]):
-                daily_forecast.append({
+            daily = data["daily"]
+            daily_forecast = [
+                {
                     "date": date,
-                    "max_temp": f"{data['daily']['temperature_2m_max'][i]}°C",
-                    "min_temp": f"{data['daily']['temperature_2m_min'][i]}°C",
-                    "precipitation": f"{data['daily']['precipitation_sum'][i]}mm",
-                    "max_wind_speed": f"{data['daily']['wind_speed_10m_max'][i]}km/h"
-                })
+                    "max_temp": f"{max_temp}°C",
+                    "min_temp": f"{min_temp}°C",
+                    "precipitation": f"{precipitation}mm",
+                    "max_wind_speed": f"{max_wind_speed}km/h"
+                }
+                for date, max_temp, min_temp, precipitation, max_wind_speed in zip(
+                    daily["time"],
+                    daily["temperature_2m_max"],
+                    daily["temperature_2m_min"],
+                    daily["precipitation_sum"],
+                    daily["wind_speed_10m_max"]
+                )
+            ]
         
         return {
             "status": "success",
@@ -100,16 +142,23 @@ def get_weather_forecast(city: str, days: int = 3) -> dict:
         }
 
 
-def get_current_weather(city: str) -> dict:
+@ttl_cache(maxsize=256, ttl=600, key=normalize_city)
+def get_current_weather(
+    city: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None
+) -> dict:
     """Get current weather conditions for a city.
     
     Args:
         city (str): The name of the city.
+        latitude (float, optional): Latitude of the city. Skips geocoding when given with longitude.
+        longitude (float, optional): Longitude of the city. Skips geocoding when given with latitude.
         
     Returns:
         dict: status and current weather or error message.
     """
-    coords = get_city_coordinates(city)
+    coords = _resolve_coordinates(city, latitude, longitude)
     if coords["status"] == "error":
         return coords
     
@@ -118,13 +167,13 @@ def get_current_weather(city: str) -> dict:
         forecast_params = {
             "latitude": coords["latitude"],
             "longitude": coords["longitude"],
-            "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m,wind_direction_10m",
+            "current": "temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m",
             "timezone": "auto"
         }
         
-        response = requests.get(forecast_url, params=forecast_params)
+        response = SESSION.get(forecast_url, params=forecast_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         current = data.get("current", {})
         
@@ -148,8 +197,6 @@ def get_current_weather(city: str) -> dict:
         }
 
 
-from typing import Optional
-
 def get_air_quality(city: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict:
     """Get air quality information for a city.
     
@@ -182,9 +229,9 @@ def get_air_quality(city: str, start_date: Optional[str] = None, end_date: Optio
             "timezone": "auto"
         }
         
-        response = requests.get(air_url, params=air_params)
+        response = SESSION.get(air_url, params=air_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         current = data.get("current", {})
         
@@ -238,21 +285,29 @@ def get_marine_weather(city: str) -> dict:
             "timezone": "auto"
         }
         
-        response = requests.get(marine_url, params=marine_params)
+        response = SESSION.get(marine_url, params=marine_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         current = data.get("current", {})
         daily_forecast = []
         
         if "daily" in data:
-            for i, date in enumerate(data["daily"]["time"]):
-                daily_forecast.append({
+            daily = data["daily"]
+            daily_forecast = [
+                {
                     "date": date,
-                    "max_wave_height": f"{data['daily']['wave_height_max'][i]}m",
-                    "dominant_wave_direction": f"{data['daily']['wave_direction_dominant'][i]}°",
-                    "max_wave_period": f"{data['daily']['wave_period_max'][i]}s"
-                })
+                    "max_wave_height": f"{wave_height}m",
+                    "dominant_wave_direction": f"{wave_direction}°",
+                    "max_wave_period": f"{wave_period}s"
+                }
+                for date, wave_height, wave_direction, wave_period in zip(
+                    daily["time"],
+                    daily["wave_height_max"],
+                    daily["wave_direction_dominant"],
+                    daily["wave_period_max"]
+                )
+            ]
         
         return {
             "status": "success",
@@ -273,54 +328,118 @@ def get_marine_weather(city: str) -> dict:
         }
 
 
-def get_historical_weather(city: str, start_date: str, end_date: str) -> dict:
+def get_historical_weather(
+    city: str,
+    start_date: str,
+    end_date: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    aggregation: Optional[str] = None
+) -> dict:
     """Get historical weather data for a city.
     
     Args:
         city (str): The name of the city.
         start_date (str): Start date in YYYY-MM-DD format.
         end_date (str): End date in YYYY-MM-DD format.
+        latitude (float, optional): Latitude of the city. Skips geocoding when given with longitude.
+        longitude (float, optional): Longitude of the city. Skips geocoding when given with latitude.
+        aggregation (str, optional): "daily", "monthly" or "yearly". Defaults to monthly for
+            periods longer than two years and daily otherwise.
         
     Returns:
-        dict: status and historical weather data or error message.
+        dict: status and historical weather data or error message. Includes a "note" when
+            end_date was trimmed to the latest date the archive covers.
     """
-    coords = get_city_coordinates(city)
+    # Reject invalid requests before any network call
+    try:
+        start = datetime.date.fromisoformat(start_date)
+        end = datetime.date.fromisoformat(end_date)
+    except ValueError:
+        return {
+            "status": "error",
+            "error_message": "Dates must be in YYYY-MM-DD format."
+        }
+    
+    # The archive lags real time by about five days
+    latest_available = datetime.date.today() - datetime.timedelta(days=5)
+    if start > end:
+        return {
+            "status": "error",
+            "error_message": f"Start date {start_date} is after end date {end_date}."
+        }
+    if start < _ARCHIVE_MIN_DATE:
+        return {
+            "status": "error",
+            "error_message": f"Historical data is only available from {_ARCHIVE_MIN_DATE.isoformat()}."
+        }
+    if start > latest_available:
+        return {
+            "status": "error",
+            "error_message": (
+                f"Historical data is only available up to {latest_available.isoformat()}. "
+                "Use the current weather or forecast tools for more recent dates."
+            )
+        }
+    
+    # Trim the trailing days the archive has not filled yet rather than return empty rows
+    note = None
+    if end > latest_available:
+        end = latest_available
+        end_date = end.isoformat()
+        note = (
+            f"End date trimmed to {end_date}; the archive lags real time by about five days. "
+            "Use the current weather or forecast tools for more recent dates."
+        )
+    
+    if aggregation is None:
+        aggregation = "monthly" if (end - start).days > 730 else "daily"
+    if aggregation not in ("daily", "monthly", "yearly"):
+        return {
+            "status": "error",
+            "error_message": f"Unsupported aggregation '{aggregation}'. Use 'daily', 'monthly' or 'yearly'."
+        }
+    
+    coords = _resolve_coordinates(city, latitude, longitude)
     if coords["status"] == "error":
         return coords
     
     try:
-        historical_url = "https://archive-api.open-meteo.com/v1/archive"
-        historical_params = {
-            "latitude": coords["latitude"],
-            "longitude": coords["longitude"],
-            "start_date": start_date,
-            "end_date": end_date,
-            "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
-            "timezone": "auto"
-        }
-        
-        response = requests.get(historical_url, params=historical_params)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_daily_archive(coords["latitude"], coords["longitude"], start_date, end_date)
         
         daily_data = []
-        if "daily" in data:
-            for i, date in enumerate(data["daily"]["time"]):
-                daily_data.append({
+        if "daily" in data and aggregation in ("monthly", "yearly"):
+            period = "month" if aggregation == "monthly" else "year"
+            daily_data = _summarize_by_period(data["daily"], period)
+        elif "daily" in data:
+            daily = data["daily"]
+            daily_data = [
+                {
                     "date": date,
-                    "max_temp": f"{data['daily']['temperature_2m_max'][i]}°C",
-                    "min_temp": f"{data['daily']['temperature_2m_min'][i]}°C",
-                    "precipitation": f"{data['daily']['precipitation_sum'][i]}mm"
-                })
-        
-        return {
+                    "max_temp": f"{max_temp}°C",
+                    "min_temp": f"{min_temp}°C",
+                    "precipitation": f"{precipitation}mm"
+                }
+                for date, max_temp, min_temp, precipitation in zip(
+                    daily["time"],
+                    daily["temperature_2m_max"],
+                    daily["temperature_2m_min"],
+                    daily["precipitation_sum"]
+                )
+            ]
+        
+        result = {
             "status": "success",
             "city": coords["name"],
             "country": coords["country"],
             "period": f"{start_date} to {end_date}",
+            "aggregation": aggregation,
             "historical_data": daily_data,
             "units": data.get("daily_units", {})
         }
+        if note:
+            result["note"] = note
+        return result
     except Exception as e:
         return {
             "status": "error",
@@ -354,31 +473,11 @@ def get_climate_forecast(city: str, year: int = 2040) -> dict:
             "timezone": "auto"
         }
         
-        response = requests.get(climate_url, params=climate_params)
+        response = SESSION.get(climate_url, params=climate_params, timeout=TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Calculate monthly averages
-        monthly_avg = {}
-        if "daily" in data:
-            for i, date in enumerate(data["daily"]["time"]):
-                month = date[:7]  # YYYY-MM
-                if month not in monthly_avg:
-                    monthly_avg[month] = {"temps_max": [], "temps_min": [], "precip": []}
-                
-                monthly_avg[month]["temps_max"].append(data["daily"]["temperature_2m_max"][i])
-                monthly_avg[month]["temps_min"].append(data["daily"]["temperature_2m_min"][i])
-                monthly_avg[month]["precip"].append(data["daily"]["precipitation_sum"][i])
-        
-        # Format monthly summaries
-        monthly_summary = []
-        for month, values in monthly_avg.items():
-            monthly_summary.append({
-                "month": month,
-                "avg_max_temp": f"{sum(values['temps_max'])/len(values['temps_max']):.1f}°C",
-                "avg_min_temp": f"{sum(values['temps_min'])/len(values['temps_min']):.1f}°C",
-                "total_precipitation": f"{sum(values['precip']):.1f}mm"
-            })
+        monthly_summary = _summarize_by_period(data["daily"]) if "daily" in data else []
         
         return {
             "status": "success",
@@ -395,16 +494,77 @@ def get_climate_forecast(city: str, year: int = 2040) -> dict:
         }
 
 
-def get_weather(city: str) -> dict:
+def _summarize_by_period(daily: dict, period: str = "month") -> list:
+    """Summarize daily temperature and precipitation columns into monthly or yearly figures.
+    
+    Args:
+        daily (dict): Open-Meteo "daily" block with time, temperature_2m_max,
+            temperature_2m_min and precipitation_sum columns.
+        period (str): "month" or "year" (default: "month").
+        
+    Returns:
+        list: One entry per period with average temperatures, total precipitation and
+            how many of the period's days had precipitation data.
+    """
+    key_length = 7 if period == "month" else 4  # YYYY-MM or YYYY
+    # Running totals per period: [max temp days, sum of max temps, min temp days,
+    # sum of min temps, precipitation days, total precipitation]. Missing (None)
+    # values are skipped and not counted.
+    period_totals = {}
+    for date, temp_max, temp_min, precip in zip(
+        daily["time"],
+        daily["temperature_2m_max"],
+        daily["temperature_2m_min"],
+        daily["precipitation_sum"]
+    ):
+        totals = period_totals.setdefault(date[:key_length], [0, 0.0, 0, 0.0, 0, 0.0])
+        if temp_max is not None:
+            totals[0] += 1
+            totals[1] += temp_max
+        if temp_min is not None:
+            totals[2] += 1
+            totals[3] += temp_min
+        if precip is not None:
+            totals[4] += 1
+            totals[5] += precip
+    
+    return [
+        {
+            period: key,
+            "avg_max_temp": f"{sum_max / max_days:.1f}°C" if max_days else "N/A",
+            "avg_min_temp": f"{sum_min / min_days:.1f}°C" if min_days else "N/A",
+            "total_precipitation": f"{total_precip:.1f}mm" if precip_days else "N/A",
+            "precipitation_coverage": f"{precip_days}/{_days_in_period(key)} days"
+        }
+        for key, (max_days, sum_max, min_days, sum_min, precip_days, total_precip)
+        in period_totals.items()
+    ]
+
+
+def _days_in_period(key: str) -> int:
+    """Return the number of calendar days in a "YYYY-MM" month or "YYYY" year."""
+    year = int(key[:4])
+    if len(key) == 4:
+        return 366 if calendar.isleap(year) else 365
+    return calendar.monthrange(year, int(key[5:7]))[1]
+
+
+def get_weather(
+    city: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None
+) -> dict:
     """Retrieves the current weather report for a specified city.
 
     Args:
         city (str): The name of the city for which to retrieve the weather report.
+        latitude (float, optional): Latitude of the city. Skips geocoding when given with longitude.
+        longitude (float, optional): Longitude of the city. Skips geocoding when given with latitude.
 
     Returns:
         dict: status and result or error msg.
     """
-    return get_current_weather(city)
+    return get_current_weather(city, latitude=latitude, longitude=longitude)
 
 
 def get_current_time(city: str) -> dict:
@@ -416,42 +576,7 @@ def get_current_time(city: str) -> dict:
     Returns:
         dict: status and result or error msg.
     """
-    coords = get_city_coordinates(city)
-    if coords["status"] == "error":
-        return coords
-    
-    try:
-        # Use the timezone from geocoding result or fallback to auto
-        tz_identifier = coords.get("timezone", "auto")
-        
-        if tz_identifier == "auto":
-            # Fallback for common cities
-            city_lower = city.lower()
-            timezone_map = {
-                "new york": "America/New_York",
-                "london": "Europe/London",
-                "paris": "Europe/Paris",
-                "tokyo": "Asia/Tokyo",
-                "sydney": "Australia/Sydney",
-                "los angeles": "America/Los_Angeles",
-                "chicago": "America/Chicago",
-                "berlin": "Europe/Berlin",
-                "mumbai": "Asia/Kolkata",
-                "beijing": "Asia/Shanghai"
-            }
-            tz_identifier = timezone_map.get(city_lower, "UTC")
-        
-        tz = ZoneInfo(tz_identifier)
-        now = datetime.datetime.now(tz)
-        report = (
-            f'The current time in {coords["name"]} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
-        )
-        return {"status": "success", "report": report}
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error getting time for '{city}': {str(e)}"
-        }
+    return current_time(city, get_city_coordinates)
 
 
 meterologist = Agent(
@@ -0,0 +1,146 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+def _default_key(*args, **kwargs) -> Hashable:
+    """Build a cache key from positional and keyword arguments."""
+    return args + tuple(sorted(kwargs.items()))
+
+
+def _is_success(result: Any) -> bool:
+    """Return True for tool results whose status is "success"."""
+    return isinstance(result, dict) and result.get("status") == "success"
+
+
+def ttl_cache(
+    maxsize: int = 128,
+    ttl: Optional[float] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+    max_stale: Optional[float] = None
+) -> Callable:
+    """Cache successful tool results in memory with LRU eviction and an optional TTL.
+
+    By default only results whose "status" is "success" are stored, so API
+    errors are retried on the next call instead of being served from the cache.
+    Concurrent misses on the same key are collapsed: one caller runs the
+    function while the others wait for its result.
+
+    With max_stale, expired entries are kept until they are max_stale seconds
+    old; when a refresh fails within that window, the last good result is
+    returned with "stale": True instead of the error.
+
+    Args:
+        maxsize (int): Maximum number of cached results (default: 128).
+        ttl (Optional[float]): Seconds before an entry expires, or None to keep it until evicted (default: None).
+        key (Optional[Callable[..., Hashable]]): Builds the cache key from the call arguments (default: all arguments).
+        cache_if (Optional[Callable[[Any], bool]]): Decides whether a result is stored (default: successful tool results).
+        max_stale (Optional[float]): Seconds since caching during which the last good dict result is
+            served when a refresh is not cacheable, or None to never serve stale results (default: None).
+
+    Returns:
+        Callable: Decorator wrapping the tool function.
+    """
+    make_key = key or _default_key
+    should_cache = cache_if or _is_success
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        in_flight: "dict[Hashable, threading.Event]" = {}
+        lock = threading.Lock()
+
+        def get_fresh(cache_key: Hashable, now: float) -> tuple:
+            """Return (True, result) for a live entry, else (False, None). Caller holds lock."""
+            entry = entries.get(cache_key)
+            if entry is not None:
+                stored_at, result = entry
+                if ttl is None or now - stored_at < ttl:
+                    entries.move_to_end(cache_key)
+                    return True, result
+                if max_stale is None or now - stored_at >= max_stale:
+                    del entries[cache_key]
+            return False, None
+
+        def get_stale(cache_key: Hashable) -> Optional[dict]:
+            """Return the expired entry marked stale, if it is within max_stale."""
+            if max_stale is None:
+                return None
+            with lock:
+                entry = entries.get(cache_key)
+            if entry is None or time.monotonic() - entry[0] >= max_stale:
+                return None
+            return {**entry[1], "stale": True}
+
+        def fall_back(cache_key: Hashable, result: Any) -> Any:
+            """Replace an uncacheable result with the expired entry, if allowed."""
+            if max_stale is None or should_cache(result):
+                return result
+            stale = get_stale(cache_key)
+            return result if stale is None else stale
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            cache_key = make_key(*args, **kwargs)
+            now = time.monotonic()
+            with lock:
+                hit, result = get_fresh(cache_key, now)
+                if hit:
+                    return result
+                pending = in_flight.get(cache_key)
+                if pending is None:
+                    pending = in_flight[cache_key] = threading.Event()
+                    leader = True
+                else:
+                    leader = False
+
+            if not leader:
+                pending.wait()
+                with lock:
+                    hit, result = get_fresh(cache_key, time.monotonic())
+                if hit:
+                    return result
+                # The leading call's result was not cacheable (e.g. an error).
+                # Serve the stale entry it fell back to rather than wait out
+                # another failing call; without one, make our own attempt.
+                stale = get_stale(cache_key)
+                if stale is not None:
+                    return stale
+                return fall_back(cache_key, func(*args, **kwargs))
+
+            try:
+                result = func(*args, **kwargs)
+                if should_cache(result):
+                    with lock:
+                        entries[cache_key] = (now, result)
+                        entries.move_to_end(cache_key)
+                        while len(entries) > maxsize:
+                            entries.popitem(last=False)
+                else:
+                    result = fall_back(cache_key, result)
+            finally:
+                with lock:
+                    del in_flight[cache_key]
+                pending.set()
+            return result
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def city_key(city: str) -> str:
+    """Normalize a city name for lookups, ignoring case and surrounding whitespace."""
+    return city.strip().casefold()
+
+
+def normalize_city(city: str, *args: Any, **kwargs: Any) -> Hashable:
+    """Cache key for city lookups that ignores case and surrounding whitespace."""
+    return (city_key(city),) + args + tuple(sorted(kwargs.items()))
@@ -0,0 +1,146 @@
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .cache import city_key
+
+# Location of the on-disk cache; override with WEATHERAGENT_GEOCODE_DB.
+DB_PATH = os.environ.get(
+    "WEATHERAGENT_GEOCODE_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "weatheragent", "geocode.db")
+)
+
+# Entries older than this are refreshed from the geocoder (30 days).
+MAX_AGE = 30 * 86400
+
+# Locations answered without touching the database or the geocoder. The
+# earthquake agent's instruction places the user in Kolkata, so it is
+# looked up on almost every conversation.
+_KOLKATA = {
+    "latitude": 22.56263,
+    "longitude": 88.36304,
+    "name": "Kolkata",
+    "country": "India",
+    "timezone": "Asia/Kolkata"
+}
+_SEEDED = {
+    "kolkata": _KOLKATA,
+    "kolkata, india": _KOLKATA
+}
+
+_lock = threading.Lock()
+_connection: Optional[sqlite3.Connection] = None
+_unavailable = False
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """Open the cache database on first use.
+
+    Returns:
+        Optional[sqlite3.Connection]: The connection, or None if the database cannot be opened.
+    """
+    global _connection, _unavailable
+    if _connection is not None or _unavailable:
+        return _connection
+    try:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        connection = sqlite3.connect(DB_PATH, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS coords ("
+            "key TEXT PRIMARY KEY, latitude REAL, longitude REAL, name TEXT, "
+            "country TEXT, timezone TEXT, fetched_at INTEGER)"
+        )
+        # Sweep expired entries once per process so the file does not grow unbounded.
+        connection.execute("DELETE FROM coords WHERE fetched_at < ?", (int(time.time()) - MAX_AGE,))
+        connection.commit()
+        _connection = connection
+    except (OSError, sqlite3.Error):
+        # A read-only or missing home directory should not break geocoding.
+        _unavailable = True
+    return _connection
+
+
+def lookup(city: str) -> Optional[dict]:
+    """Return cached coordinates for a city, if present and not expired.
+
+    Args:
+        city (str): The name of the city.
+
+    Returns:
+        Optional[dict]: A successful geocoding result, or None on a cache miss.
+    """
+    key = city_key(city)
+    seeded = _SEEDED.get(key)
+    if seeded is not None:
+        return {"status": "success", **seeded}
+    with _lock:
+        connection = _connect()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(
+                "SELECT latitude, longitude, name, country, timezone FROM coords "
+                "WHERE key = ? AND fetched_at >= ?",
+                (key, int(time.time()) - MAX_AGE)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+    if row is None:
+        return None
+    return {
+        "status": "success",
+        "latitude": row[0],
+        "longitude": row[1],
+        "name": row[2],
+        "country": row[3],
+        "timezone": row[4]
+    }
+
+
+def store(city: str, result: dict) -> None:
+    """Persist a successful geocoding result.
+
+    Args:
+        city (str): The name of the city as queried.
+        result (dict): The successful result returned by get_city_coordinates.
+    """
+    with _lock:
+        connection = _connect()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO coords VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    city_key(city),
+                    result["latitude"],
+                    result["longitude"],
+                    result["name"],
+                    result.get("country", ""),
+                    result.get("timezone", "auto"),
+                    int(time.time())
+                )
+            )
+            connection.commit()
+        except sqlite3.Error:
+            pass
+
+
+def persistent_geocode(func: Callable[[str], dict]) -> Callable[[str], dict]:
+    """Serve geocoding results from the on-disk cache, writing through on a miss."""
+
+    @functools.wraps(func)
+    def wrapper(city: str) -> dict:
+        cached = lookup(city)
+        if cached is not None:
+            return cached
+        result = func(city)
+        if result.get("status") == "success":
+            store(city, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,41 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds for calls made through SESSION.
+TIMEOUT = (3, 15)
+
+# Identifies this client to the Open-Meteo and USGS APIs.
+USER_AGENT = "weatheragent/1"
+
+# Seconds a tool suggests waiting before retrying a request that timed out.
+RETRY_AFTER = 5
+
+
+def _build_session() -> requests.Session:
+    """Build the shared HTTP session used by all sub-agent tools.
+
+    Returns:
+        requests.Session: Session with a pooled, retrying adapter mounted for HTTPS.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    # Read timeouts are not retried: the request may have reached the server,
+    # and each retry would wait out another full read timeout. Retry-After is
+    # ignored because urllib3 does not cap it and the tools block while waiting;
+    # throttled requests fall back to the short exponential backoff instead.
+    retry = Retry(
+        total=3,
+        read=False,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared across the Open-Meteo and USGS tools so repeated calls reuse
+# keep-alive connections instead of paying a TCP + TLS handshake each time.
+SESSION = _build_session()
@@ -0,0 +1,44 @@
+import orjson
+
+from .cache import ttl_cache
+from .http_client import SESSION, TIMEOUT
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+# Daily columns requested from the archive. Both the meteorologist and the
+# flood agent read from this set, so one response serves either tool.
+ARCHIVE_DAILY_VARIABLES = "temperature_2m_max,temperature_2m_min,precipitation_sum"
+
+
+# A multi-decade response holds tens of thousands of values per column, so
+# keep only a few dozen in memory.
+@ttl_cache(maxsize=32, ttl=86400, cache_if=lambda data: "daily" in data)
+def fetch_daily_archive(latitude: float, longitude: float, start_date: str, end_date: str) -> dict:
+    """Fetch daily temperature and precipitation from the Open-Meteo archive API.
+
+    Responses are memoized per (latitude, longitude, start_date, end_date), so
+    repeated lookups for the same place and period share a single request.
+
+    Args:
+        latitude (float): Latitude of the location.
+        longitude (float): Longitude of the location.
+        start_date (str): Start date in YYYY-MM-DD format.
+        end_date (str): End date in YYYY-MM-DD format.
+
+    Returns:
+        dict: The decoded archive response.
+
+    Raises:
+        requests.RequestException: If the request fails.
+    """
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": start_date,
+        "end_date": end_date,
+        "daily": ARCHIVE_DAILY_VARIABLES,
+        "timezone": "auto"
+    }
+    response = SESSION.get(ARCHIVE_URL, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
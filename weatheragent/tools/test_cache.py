@@ -0,0 +1,130 @@
+import threading
+import time
+import types
+
+import pytest
+
+from weatheragent.tools import cache
+from weatheragent.tools.cache import ttl_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _run_concurrently(func, count):
+    results = [None] * count
+
+    def call(index):
+        results[index] = func("tokyo")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_misses_make_one_call():
+    calls = []
+    release = threading.Event()
+
+    @ttl_cache(ttl=60)
+    def lookup(city):
+        calls.append(city)
+        release.wait(5)
+        return {"status": "success", "city": city}
+
+    threads, results = _run_concurrently(lookup, 8)
+    # Give the followers time to block on the leader's call
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["tokyo"]
+    assert all(result is results[0] for result in results)
+
+
+def test_uncacheable_leader_result_is_not_shared():
+    calls = []
+    calls_lock = threading.Lock()
+    release = threading.Event()
+
+    @ttl_cache(ttl=60)
+    def lookup(city):
+        with calls_lock:
+            calls.append(city)
+            attempt = len(calls)
+        release.wait(5)
+        return {"status": "error", "attempt": attempt}
+
+    threads, results = _run_concurrently(lookup, 4)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # Every caller made its own attempt and received its own error
+    assert len(calls) == 4
+    assert sorted(result["attempt"] for result in results) == [1, 2, 3, 4]
+
+    # Errors are never cached
+    assert lookup("tokyo")["attempt"] == 5
+
+
+def test_failed_refresh_serves_stale_result(clock):
+    responses = [{"status": "success", "value": 1}, {"status": "error"}, {"status": "error"}]
+
+    @ttl_cache(ttl=60, max_stale=600)
+    def lookup(city):
+        return responses.pop(0)
+
+    assert lookup("tokyo") == {"status": "success", "value": 1}
+
+    clock[0] += 120
+    assert lookup("tokyo") == {"status": "success", "value": 1, "stale": True}
+
+    clock[0] += 600
+    assert lookup("tokyo") == {"status": "error"}
+
+
+def test_failed_refresh_serves_stale_result_to_waiting_callers(clock):
+    calls = []
+    release = threading.Event()
+
+    @ttl_cache(ttl=60, max_stale=600)
+    def lookup(city):
+        calls.append(city)
+        if len(calls) == 1:
+            return {"status": "success", "value": 1}
+        release.wait(5)
+        return {"status": "error"}
+
+    lookup("tokyo")
+    clock[0] += 120
+
+    threads, results = _run_concurrently(lookup, 4)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # Only the leader retried; the others took its stale fallback
+    assert len(calls) == 2
+    assert all(result == {"status": "success", "value": 1, "stale": True} for result in results)
+
+
+def test_failed_refresh_without_max_stale_returns_error(clock):
+    responses = [{"status": "success", "value": 1}, {"status": "error"}]
+
+    @ttl_cache(ttl=60)
+    def lookup(city):
+        return responses.pop(0)
+
+    lookup("tokyo")
+    clock[0] += 120
+    assert lookup("tokyo") == {"status": "error"}
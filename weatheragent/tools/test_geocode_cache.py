@@ -0,0 +1,114 @@
+import types
+
+import pytest
+
+from weatheragent.tools import geocode_cache
+from weatheragent.tools.geocode_cache import MAX_AGE, lookup, persistent_geocode, store
+
+TOKYO = {
+    "status": "success",
+    "latitude": 35.6895,
+    "longitude": 139.69171,
+    "name": "Tokyo",
+    "country": "Japan",
+    "timezone": "Asia/Tokyo"
+}
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point the cache at a fresh database under tmp_path."""
+    path = tmp_path / "geocode.db"
+    monkeypatch.setattr(geocode_cache, "DB_PATH", str(path))
+    monkeypatch.setattr(geocode_cache, "_connection", None)
+    monkeypatch.setattr(geocode_cache, "_unavailable", False)
+    yield path
+    _close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's wall clock with one the test advances by hand."""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(geocode_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _close():
+    if geocode_cache._connection is not None:
+        geocode_cache._connection.close()
+        geocode_cache._connection = None
+
+
+def _counting_geocoder(result):
+    calls = []
+
+    @persistent_geocode
+    def geocode(city):
+        calls.append(city)
+        return result
+
+    return geocode, calls
+
+
+def test_miss_writes_through_and_next_lookup_hits(database):
+    geocode, calls = _counting_geocoder(TOKYO)
+
+    assert geocode("Tokyo") == TOKYO
+    assert geocode("  TOKYO ") == TOKYO
+    assert calls == ["Tokyo"]
+    assert database.exists()
+
+
+def test_errors_are_not_stored(database):
+    geocode, calls = _counting_geocoder({"status": "error", "error_message": "City 'Nowhere' not found."})
+
+    geocode("Nowhere")
+    geocode("Nowhere")
+
+    assert calls == ["Nowhere", "Nowhere"]
+    assert lookup("Nowhere") is None
+
+
+def test_entries_expire_after_max_age(database, clock):
+    store("Tokyo", TOKYO)
+
+    clock[0] += MAX_AGE - 1
+    assert lookup("Tokyo") == TOKYO
+
+    clock[0] += 2
+    assert lookup("Tokyo") is None
+
+
+def test_expired_entries_are_swept_on_open(database, clock):
+    store("Tokyo", TOKYO)
+    _close()
+
+    clock[0] += MAX_AGE + 1
+    geocode_cache._connect()
+
+    rows = geocode_cache._connection.execute("SELECT COUNT(*) FROM coords").fetchone()[0]
+    assert rows == 0
+
+
+def test_seeded_city_needs_no_database(database):
+    result = lookup(" Kolkata, India ")
+
+    assert result["name"] == "Kolkata"
+    assert result["timezone"] == "Asia/Kolkata"
+    assert geocode_cache._connection is None
+
+
+def test_unavailable_database_falls_back_to_geocoder(tmp_path, monkeypatch):
+    # A regular file where the cache directory should be makes the database unopenable
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(geocode_cache, "DB_PATH", str(blocker / "geocode.db"))
+    monkeypatch.setattr(geocode_cache, "_connection", None)
+    monkeypatch.setattr(geocode_cache, "_unavailable", False)
+    geocode, calls = _counting_geocoder(TOKYO)
+
+    assert geocode("Tokyo") == TOKYO
+    assert geocode("Tokyo") == TOKYO
+    assert calls == ["Tokyo", "Tokyo"]
+    assert geocode_cache._unavailable
@@ -0,0 +1,64 @@
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from weatheragent.sub_agents.earthquake_agent import agent as earthquake_agent
+from weatheragent.tools.http_client import RETRY_AFTER, _build_session
+
+
+@pytest.fixture
+def silent_server():
+    """A local server that accepts connections but never replies."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    accepted = []
+    stop = threading.Event()
+
+    def accept_loop():
+        listener.settimeout(0.1)
+        while not stop.is_set():
+            try:
+                accepted.append(listener.accept()[0])
+            except socket.timeout:
+                continue
+
+    thread = threading.Thread(target=accept_loop, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}/", accepted
+    stop.set()
+    thread.join()
+    for connection in accepted:
+        connection.close()
+    listener.close()
+
+
+def test_read_timeout_is_raised_after_one_attempt(silent_server):
+    url, accepted = silent_server
+    session = _build_session()
+    # Mount the production adapter for plain HTTP so the local server exercises its Retry.
+    session.mount("http://", session.get_adapter("https://"))
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        session.get(url, timeout=(1, 0.5))
+
+    assert time.monotonic() - started < 2
+    assert len(accepted) == 1
+
+
+def test_earthquake_data_reports_timeout_with_retry_after(monkeypatch):
+    class TimingOutSession:
+        def get(self, *args, **kwargs):
+            raise requests.exceptions.ReadTimeout("read timed out")
+
+    monkeypatch.setattr(earthquake_agent, "SESSION", TimingOutSession())
+    earthquake_agent.get_earthquake_data.cache_clear()
+
+    result = earthquake_agent.get_earthquake_data(latitude=0.0, longitude=0.0, radius_km=100)
+
+    assert result["status"] == "error"
+    assert result["retry_after"] == RETRY_AFTER
@@ -0,0 +1,60 @@
+import datetime
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from .cache import city_key
+
+# Timezones for common cities, resolved without calling the geocoder
+COMMON_CITY_TIMEZONES = {
+    "new york": "America/New_York",
+    "london": "Europe/London",
+    "paris": "Europe/Paris",
+    "tokyo": "Asia/Tokyo",
+    "sydney": "Australia/Sydney",
+    "los angeles": "America/Los_Angeles",
+    "chicago": "America/Chicago",
+    "berlin": "Europe/Berlin",
+    "mumbai": "Asia/Kolkata",
+    "kolkata": "Asia/Kolkata",
+    "beijing": "Asia/Shanghai"
+}
+
+
+def current_time(city: str, geocode: Callable[[str], dict]) -> dict:
+    """Report the current time in a city.
+
+    Common cities are looked up in COMMON_CITY_TIMEZONES; any other city is
+    geocoded to find its timezone.
+
+    Args:
+        city (str): The name of the city.
+        geocode (Callable[[str], dict]): The agent's get_city_coordinates.
+
+    Returns:
+        dict: status and result or error msg.
+    """
+    tz_identifier = COMMON_CITY_TIMEZONES.get(city_key(city))
+    if tz_identifier:
+        display_name = city.strip().title()
+    else:
+        coords = geocode(city)
+        if coords["status"] == "error":
+            return coords
+        display_name = coords["name"]
+        # Use the timezone from geocoding result or fall back to UTC
+        tz_identifier = coords.get("timezone", "auto")
+        if tz_identifier == "auto":
+            tz_identifier = "UTC"
+
+    try:
+        tz = ZoneInfo(tz_identifier)
+        now = datetime.datetime.now(tz)
+        report = (
+            f'The current time in {display_name} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
+        )
+        return {"status": "success", "report": report}
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error getting time for '{city}': {str(e)}"
+        }